@@ -1,11 +1,45 @@
 import math
-from scipy.stats import norm
+import numpy as np
+from scipy.special import ndtr
+from scipy.optimize import brentq
+from py_lets_be_rational import implied_volatility_from_a_transformed_rational_guess
+from py_lets_be_rational.exceptions import BelowIntrinsicException, AboveMaximumException, VolatilityValueException
+from numba import njit, prange
 from abc import ABC, abstractmethod
 
+BLACK_SCHOLES = 0
+BACHELIER = 1
+
+SIGMA_MIN = 1e-6  # minimum volatility (near zero)
+SIGMA_MAX = 5.0   # maximum volatility for Black-Scholes, SIGMA_MAX * S for Bachelier
+
+INV_SQRT_2PI = 0.3989422804014327  # 1 / sqrt(2 * pi), normal pdf scale
+
+# fastmath and the numpy error model (no ZeroDivisionError checks) let LLVM vectorize the
+# transcendentals, through Intel SVML when it is available (numba -s, "SVML State").
+# The 'nnan'/'ninf' flags are left out since the solvers signal failure with nan.
+_JIT_OPTIONS = dict(fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'}, cache=True, nogil=True,
+                    error_model='numpy')
+
+
+@njit(**_JIT_OPTIONS)
+def _bachelier_d_scale(r: float, T: float) -> float:
+    """
+    Bachelier d_denominator / sigma = sqrt((exp(2rT) - 1) / (2r))
+
+    Uses the Taylor expansion sqrt(T * (1 + x/2 + x^2/6)), x = 2rT, for small |x| to avoid
+    the cancellation as r -> 0, and expm1 otherwise.
+    """
+    x = 2.0 * r * T
+    if abs(x) < 1e-4:
+        return math.sqrt(T) * math.sqrt(1.0 + x * 0.5 + x * x / 6.0)
+    return math.sqrt(math.expm1(x) / (2.0 * r))
+
+
 class PricingModel(ABC):
     @abstractmethod
     def calculate_price(self, S: float, K: float, T: float, r: float, 
-                       sigma: float, option_type: str) -> float:
+                       sigma: float, is_call: bool) -> float:
         """ 
         Input:
             S: Spot price
@@ -13,34 +47,93 @@ class PricingModel(ABC):
             T: Time to maturity
             r: Risk-free rate
             sigma: Volatility
-            option_type: 'Call' or 'Put'
+            is_call: True for a call, False for a put
         
         Output:
             Option price
         """
         pass
 
+    @abstractmethod
+    def calculate_vega(self, S: float, K: float, T: float, r: float, 
+                       sigma: float, is_call: bool) -> float:
+        """ 
+        Input: same as calculate_price
+        
+        Output:
+            First derivative of the option price w.r.t. the volatility
+        """
+        pass
+
+    @abstractmethod
+    def price_and_vega(self, S: float, K: float, T: float, r: float, 
+                       sigma: float, is_call: bool) -> tuple:
+        """ 
+        Input: same as calculate_price
+        
+        Output:
+            (Option price, vega), sharing the intermediate terms
+        """
+        pass
+
 class BSModel(PricingModel):
     def calculate_price(self, S: float, K: float, T: float, r: float, 
-                       sigma: float, option_type: str) -> float:
+                       sigma: float, is_call: bool) -> float:
         """
         Calculate Black-Scholes option price.
         """
         if T <= 0 or sigma <= 0:
             return 0.0
         
-        d1 = (math.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * math.sqrt(T))
-        d2 = d1 - sigma * math.sqrt(T)
+        sqrt_T = math.sqrt(T)
+        sig_sqrt_T = sigma * sqrt_T
+        disc = math.exp(-r * T)
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sig_sqrt_T
+        d2 = d1 - sig_sqrt_T
         
-        if option_type == "Call":
-            price = S * norm.cdf(d1) - K * math.exp(-r * T) * norm.cdf(d2)
+        if is_call:
+            price = S * ndtr(d1) - K * disc * ndtr(d2)
         else:
-            price = K * math.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+            price = K * disc * ndtr(-d2) - S * ndtr(-d1)
         
         return max(price, 0.0)
+
+    def calculate_vega(self, S: float, K: float, T: float, r: float, 
+                       sigma: float, is_call: bool) -> float:
+        """
+        Calculate Black-Scholes vega, S * pdf(d1) * sqrt(T).
+        """
+        if T <= 0 or sigma <= 0:
+            return 0.0
+
+        sqrt_T = math.sqrt(T)
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+
+        return S * INV_SQRT_2PI * math.exp(-0.5 * d1 * d1) * sqrt_T
+
+    def price_and_vega(self, S: float, K: float, T: float, r: float, 
+                       sigma: float, is_call: bool) -> tuple:
+        """
+        Calculate Black-Scholes option price and vega together.
+        """
+        if T <= 0 or sigma <= 0:
+            return 0.0, 0.0
+
+        sqrt_T = math.sqrt(T)
+        sig_sqrt_T = sigma * sqrt_T
+        disc = math.exp(-r * T)
+        d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / sig_sqrt_T
+        d2 = d1 - sig_sqrt_T
+
+        if is_call:
+            price = S * ndtr(d1) - K * disc * ndtr(d2)
+        else:
+            price = K * disc * ndtr(-d2) - S * ndtr(-d1)
+
+        return max(price, 0.0), S * INV_SQRT_2PI * math.exp(-0.5 * d1 * d1) * sqrt_T
     
 class BachelierModel(PricingModel):
-    def calculate_price(self, S: float, K: float, T: float, r: float, sigma: float, option_type: str) -> float:
+    def calculate_price(self, S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
         """
         Calculate Bachelier option price.
         """
@@ -49,23 +142,297 @@ class BachelierModel(PricingModel):
         
         F = S * math.exp(r * T)
 
-        d_denominator = math.sqrt(sigma ** 2 * (math.exp(2 * r * T) - 1) / (2 * r)) if r != 0 else sigma * math.sqrt(T)
+        d_denominator = sigma * _bachelier_d_scale(r, T)
 
         d = (F - K) / d_denominator
+        pdf_d = INV_SQRT_2PI * math.exp(-0.5 * d * d)
 
-        if option_type == "Call":
-            price = math.exp(-r * T) * ((F - K) * norm.cdf(d) + d_denominator * norm.pdf(d))
+        if is_call:
+            price = math.exp(-r * T) * ((F - K) * ndtr(d) + d_denominator * pdf_d)
         else:
-            price = math.exp(-r * T) * ((K - F) * norm.cdf(-d) + d_denominator * norm.pdf(d))
+            price = math.exp(-r * T) * ((K - F) * ndtr(-d) + d_denominator * pdf_d)
         
         return max(price, 0.0)
+
+    def calculate_vega(self, S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
+        """
+        Calculate Bachelier vega, exp(-rT) * d_denominator * pdf(d) / sigma.
+
+        d_denominator is linear in sigma, so the cdf terms cancel in the derivative.
+        """
+        if T <= 0 or sigma <= 0:
+            return 0.0
+
+        F = S * math.exp(r * T)
+
+        d_denominator = sigma * _bachelier_d_scale(r, T)
+
+        d = (F - K) / d_denominator
+
+        return math.exp(-r * T) * d_denominator * INV_SQRT_2PI * math.exp(-0.5 * d * d) / sigma
+
+    def price_and_vega(self, S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> tuple:
+        """
+        Calculate Bachelier option price and vega together.
+        """
+        if T <= 0 or sigma <= 0:
+            return 0.0, 0.0
+
+        disc = math.exp(-r * T)
+        F = S / disc
+
+        d_denominator = sigma * _bachelier_d_scale(r, T)
+
+        d = (F - K) / d_denominator
+        pdf_d = INV_SQRT_2PI * math.exp(-0.5 * d * d)
+
+        if is_call:
+            price = disc * ((F - K) * ndtr(d) + d_denominator * pdf_d)
+        else:
+            price = disc * ((K - F) * ndtr(-d) + d_denominator * pdf_d)
+
+        return max(price, 0.0), disc * d_denominator * pdf_d / sigma
     
 
+@njit(**_JIT_OPTIONS)
+def _norm_cdf_njit(x: float) -> float:
+    return 0.5 * math.erfc(-x / math.sqrt(2.0))
+
+
+@njit(**_JIT_OPTIONS)
+def _norm_pdf_njit(x: float) -> float:
+    return INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+@njit(**_JIT_OPTIONS)
+def _bs_price_and_vega_njit(S: float, K_disc: float, log_moneyness: float, sqrt_T: float,
+                            sigma: float, is_call: bool):
+    """
+    Compiled counterpart of BSModel.price_and_vega.
+
+    K_disc = K * exp(-rT) and log_moneyness = log(S / K_disc) do not depend on sigma
+    and are computed once per option by _precompute_njit.
+    """
+    if sigma <= 0.0:
+        return 0.0, 0.0
+
+    sig_sqrt_T = sigma * sqrt_T
+    d1 = log_moneyness / sig_sqrt_T + 0.5 * sig_sqrt_T
+    d2 = d1 - sig_sqrt_T
+
+    if is_call:
+        price = S * _norm_cdf_njit(d1) - K_disc * _norm_cdf_njit(d2)
+    else:
+        price = K_disc * _norm_cdf_njit(-d2) - S * _norm_cdf_njit(-d1)
+
+    return max(price, 0.0), S * _norm_pdf_njit(d1) * sqrt_T
+
+
+@njit(**_JIT_OPTIONS)
+def _bachelier_price_and_vega_njit(forward_moneyness: float, disc: float, d_scale: float,
+                                   sigma: float, is_call: bool):
+    """
+    Compiled counterpart of BachelierModel.price_and_vega.
+
+    forward_moneyness = F - K, disc = exp(-rT) and d_scale = d_denominator / sigma do not
+    depend on sigma and are computed once per option by _precompute_njit.
+    """
+    if sigma <= 0.0:
+        return 0.0, 0.0
+
+    d_denominator = sigma * d_scale
+    d = forward_moneyness / d_denominator
+    pdf_d = _norm_pdf_njit(d)
+
+    if is_call:
+        price = disc * (forward_moneyness * _norm_cdf_njit(d) + d_denominator * pdf_d)
+    else:
+        price = disc * (-forward_moneyness * _norm_cdf_njit(-d) + d_denominator * pdf_d)
+
+    return max(price, 0.0), disc * d_scale * pdf_d
+
+
+@njit(**_JIT_OPTIONS)
+def _precompute_njit(S: float, K: float, T: float, r: float, model_id: int):
+    """
+    Compute the sigma-independent terms of the pricing formula once per option.
+    """
+    disc = math.exp(-r * T)
+    if model_id == BLACK_SCHOLES:
+        K_disc = K * disc
+        return S, K_disc, math.log(S / K_disc), math.sqrt(T)
+
+    return S / disc - K, disc, _bachelier_d_scale(r, T), 0.0
+
+
+@njit(**_JIT_OPTIONS)
+def _price_and_vega_njit(c0: float, c1: float, c2: float, c3: float, sigma: float, is_call: bool,
+                         model_id: int):
+    if model_id == BLACK_SCHOLES:
+        return _bs_price_and_vega_njit(c0, c1, c2, c3, sigma, is_call)
+    return _bachelier_price_and_vega_njit(c0, c1, c2, sigma, is_call)
+
+
+@njit(**_JIT_OPTIONS)
+def _initial_guess_njit(S: float, K: float, T: float, r: float, market_price: float, is_call: bool,
+                        model_id: int) -> float:
+    """
+    Brenner-Subrahmanyam initial guess of sigma from the time value of the option
+
+    sigma ~ sqrt(2 * pi / T) * time value, divided by S for Black-Scholes, clamped to
+    [0.01, 3.0] (Black-Scholes) or [0.01 * S, 3.0 * S] (Bachelier).
+    """
+    disc_K = K * math.exp(-r * T)
+    intrinsic = max(S - disc_K, 0.0) if is_call else max(disc_K - S, 0.0)
+    sigma = math.sqrt(2.0 * math.pi / T) * (market_price - intrinsic)
+
+    scale = S if model_id == BACHELIER else 1.0
+    if model_id == BLACK_SCHOLES:
+        sigma = sigma / S
+    return min(max(sigma, 0.01 * scale), 3.0 * scale)
+
+
+@njit(**_JIT_OPTIONS)
+def _implied_vol_njit(S: float, K: float, T: float, r: float, market_price: float, is_call: bool,
+                      model_id: int, tolerance: float, max_iteration: int) -> float:
+    """
+    Compiled Newton's method, see ImpliedVol.calculate_implied_vol.
+
+    The input is assumed to be valid. Returns nan if Newton fails to converge, in which
+    case the caller falls back to Brent's method in _brent_implied_vol.
+    """
+    c0, c1, c2, c3 = _precompute_njit(S, K, T, r, model_id)
+
+    sigma = _initial_guess_njit(S, K, T, r, market_price, is_call, model_id)
+
+    # Newton's method
+    for _ in range(max_iteration):
+        price, vega = _price_and_vega_njit(c0, c1, c2, c3, sigma, is_call, model_id)
+
+        if abs(vega) < 1e-10:
+            break
+
+        price_diff = price - market_price
+
+        if abs(price_diff) < tolerance:
+            return sigma
+
+        sigma_updated = sigma - price_diff / vega
+
+        if sigma_updated <= 0.0:
+            sigma = sigma / 2.0
+        else:
+            sigma = sigma_updated
+
+    return math.nan
+
+
+@njit(**_JIT_OPTIONS)
+def _input_valid_njit(S: float, K: float, T: float, r: float, market_price: float, is_call: bool,
+                      model_id: int) -> bool:
+    """
+    Compiled counterpart of ImpliedVol.input_validation.
+    """
+    if not (math.isfinite(S) and math.isfinite(K) and math.isfinite(T) and math.isfinite(r)
+            and math.isfinite(market_price)):
+        return False
+    if T <= 0.0 or S <= 0.0 or K <= 0.0 or market_price < 0.0:
+        return False
+
+    disc_K = K * math.exp(-r * T)
+    if is_call:
+        lower, upper = S - disc_K, S
+    else:
+        lower, upper = disc_K - S, disc_K
+
+    if market_price < lower:
+        return False
+    if model_id == BLACK_SCHOLES and market_price > upper:
+        return False
+    return True
+
+
+@njit(**_JIT_OPTIONS)
+def _bound_implied_vol_njit(S: float, K: float, T: float, r: float, market_price: float, is_call: bool,
+                            model_id: int, tolerance: float) -> float:
+    """
+    Implied volatility of a valid option priced at its lower/upper bound, nan otherwise
+
+    A price at the intrinsic value gives the minimum volatility SIGMA_MIN, and a Black-Scholes
+    price at the upper bound (S for a call, K * exp(-rT) for a put) gives SIGMA_MAX, so
+    these options skip the solver.
+    """
+    disc_K = K * math.exp(-r * T)
+    intrinsic = max(S - disc_K, 0.0) if is_call else max(disc_K - S, 0.0)
+    if abs(market_price - intrinsic) < tolerance:
+        return SIGMA_MIN
+
+    if model_id == BLACK_SCHOLES:
+        upper = S if is_call else disc_K
+        if abs(market_price - upper) < tolerance:
+            return SIGMA_MAX
+    return math.nan
+
+
+@njit(**_JIT_OPTIONS)
+def _solve_row_njit(i, S, K, T, r, market_price, is_call, model_id, tolerance, max_iteration, out, valid):
+    valid[i] = _input_valid_njit(S[i], K[i], T[i], r[i], market_price[i], is_call[i] != 0, model_id)
+    if not valid[i]:
+        out[i] = math.nan
+        return
+
+    out[i] = _bound_implied_vol_njit(S[i], K[i], T[i], r[i], market_price[i], is_call[i] != 0,
+                                     model_id, tolerance)
+    if math.isnan(out[i]):
+        out[i] = _implied_vol_njit(S[i], K[i], T[i], r[i], market_price[i], is_call[i] != 0,
+                                   model_id, tolerance, max_iteration)
+
+
+@njit(parallel=True, boundscheck=False, **_JIT_OPTIONS)
+def _bs_batch_iv(S, K, T, r, market_price, is_call, tolerance, max_iteration, out, valid):
+    """
+    Calculate Black-Scholes implied volatilities row by row, distributing the rows across threads.
+    """
+    for i in prange(S.shape[0]):
+        _solve_row_njit(i, S, K, T, r, market_price, is_call, BLACK_SCHOLES, tolerance, max_iteration, out, valid)
+
+
+@njit(parallel=True, boundscheck=False, **_JIT_OPTIONS)
+def _bachelier_batch_iv(S, K, T, r, market_price, is_call, tolerance, max_iteration, out, valid):
+    """
+    Calculate Bachelier implied volatilities row by row, distributing the rows across threads.
+    """
+    for i in prange(S.shape[0]):
+        _solve_row_njit(i, S, K, T, r, market_price, is_call, BACHELIER, tolerance, max_iteration, out, valid)
+
+
+def _brent_implied_vol(S: float, K: float, T: float, r: float, market_price: float, is_call: bool,
+                       model_id: int, tolerance: float, max_iteration: int) -> float:
+    """
+    Solve for the implied volatility with Brent's method on [SIGMA_MIN, sigma_max]
+
+    Fallback for the options where Newton's method fails to converge. Returns nan if
+    the market price is not bracketed or Brent's method does not converge.
+    """
+    c0, c1, c2, c3 = _precompute_njit(S, K, T, r, model_id)
+    sigma_max = SIGMA_MAX if model_id == BLACK_SCHOLES else SIGMA_MAX * S
+
+    def price_diff(sigma: float) -> float:
+        return _price_and_vega_njit(c0, c1, c2, c3, sigma, is_call, model_id)[0] - market_price
+
+    try:
+        return brentq(price_diff, SIGMA_MIN, sigma_max, xtol=tolerance, maxiter=max_iteration)
+    except (ValueError, RuntimeError):
+        return float('nan')
+
+
 class ImpliedVol:
+    _MODELS = {'BlackScholes': BSModel(), 'Bachelier': BachelierModel()}
+    _MODEL_IDS = {'BlackScholes': BLACK_SCHOLES, 'Bachelier': BACHELIER}
+
     def __init__(self, S: float, K: float, T: float, r: float, market_price: float, option_type: str, model_type: str):
         self.model_type = model_type
-        self.models = {'BlackScholes': BSModel(), 'Bachelier': BachelierModel()}
-        self.model = self.models[model_type]
+        self.model = ImpliedVol._MODELS[model_type]
         self.tolerance = 1e-8
         self.max_interation = 100
 
@@ -74,99 +441,121 @@ class ImpliedVol:
         self.T = T
         self.r = r
         self.market_price = market_price
-        self.option_type = option_type
+        self.is_call = option_type == 'Call'
 
-    def calculate_implied_vol(self, ) -> float:
+    def calculate_implied_vol(self, release_gil: bool = False) -> float:
         """
         Calculate implied volatility
 
-        The main algorithm is Newton's method, and the fallback is Bisection method
+        Black-Scholes uses Jaeckel's "Let's Be Rational" algorithm. For Bachelier the main
+        algorithm is Newton's method, compiled with numba in _implied_vol_njit, and the
+        fallback is Brent's method
+
+        "Let's Be Rational" and Brent's method are pure Python and hold the GIL. With
+        release_gil=True, Black-Scholes also goes through the nogil Newton kernel so threaded
+        callers run in parallel; only the rare options where Newton fails fall back to Brent.
         """
 
         # check if the input is valid
         if not self.input_validation():
             return float('nan')
 
-        sigma = 0.2 if self.model_type == 'BlackScholes' else 0.2 * self.S # initial guess of sigma
-
-        # Newton's method
-        for _ in range(self.max_interation):
-            price = self.model.calculate_price(self.S, self.K, self.T, self.r, sigma, self.option_type)
-            vega = self.calculate_vega(sigma)
-
-            if abs(vega) < 1e-10:
-                break
-
-            price_diff = price - self.market_price
-
-            if abs(price_diff) < self.tolerance:
-                return sigma
-            
-            sigma_updated = sigma - price_diff/vega
-
-            if sigma_updated <= 0:
-                sigma = sigma / 2
-            else:
-                sigma = sigma_updated
-
-        # If Newton fails to converge, try Bisection method
-        sigma_min = 1e-6      # Minimum volatility (near zero)
-        sigma_max_bs = 5.0    # Maximum volatility for Black-Scholes
-        sigma_max_bach = 5.0 * self.S  # Maximum volatility for Bachelier
-        sigma_low = sigma_min
-        sigma_high = sigma_max_bs if self.model_type == 'BlackScholes' else sigma_max_bach
-
-        for iteration in range(self.max_interation):
-            sigma_mid = (sigma_low + sigma_high) / 2.0
-            
-            price_mid = self.model.calculate_price(self.S, self.K, self.T, self.r, sigma_mid, self.option_type)
-            diff_mid = price_mid - self.market_price
-            
-            # Check convergence
-            if abs(diff_mid) < self.tolerance:
-                return sigma_mid
-            
-            # Check if interval is too small
-            if abs(sigma_high - sigma_low) < self.tolerance:
-                return sigma_mid
-            
-            # Update bounds
-            if diff_mid < 0:  # Price too low, need higher volatility
-                sigma_low = sigma_mid
-            else:  # Price too high, need lower volatility
-                sigma_high = sigma_mid
-        return float('nan')
+        args = (float(self.S), float(self.K), float(self.T), float(self.r), float(self.market_price),
+                self.is_call, self._MODEL_IDS[self.model_type], self.tolerance, self.max_interation)
+
+        # price at the lower/upper bound, no need to solve
+        sigma = _bound_implied_vol_njit(*args[:-1])
+        if not math.isnan(sigma):
+            return sigma
+
+        if self.model_type == 'BlackScholes' and not release_gil:
+            return self.lets_be_rational_implied_vol()
 
+        sigma = _implied_vol_njit(*args)
+        if math.isnan(sigma):
+            sigma = _brent_implied_vol(*args)
+        return sigma
+
+    def lets_be_rational_implied_vol(self, ) -> float:
+        """
+        Calculate Black-Scholes implied volatility with Jaeckel's "Let's Be Rational"
+
+        The algorithm works on the undiscounted price and the forward.
+        """
+        growth = math.exp(self.r * self.T)
+        try:
+            return implied_volatility_from_a_transformed_rational_guess(
+                self.market_price * growth, self.S * growth, self.K, self.T, 1 if self.is_call else -1)
+        except (BelowIntrinsicException, AboveMaximumException, VolatilityValueException):
+            return float('nan')
 
     def calculate_vega(self, sigma) -> float:
         """
         Calculate the first derivative w.r.t. the volatility
         """
-        h = 1e-4 
-        price_up = self.model.calculate_price(self.S, self.K, self.T, self.r, sigma + h, self.option_type)
-        price_down = self.model.calculate_price(self.S, self.K, self.T, self.r, sigma - h, self.option_type)
-        
-        vega = (price_up - price_down) / (2 * h)
-        return vega
+        return self.model.calculate_vega(self.S, self.K, self.T, self.r, sigma, self.is_call)
     
     def input_validation(self,) -> bool:
         """
         Validate the input, including the lower/upper bounds check for market price
         """
-        # invalid inputs
+        # invalid inputs, NaN passes every comparison below
+        if not all(map(math.isfinite, (self.S, self.K, self.T, self.r, self.market_price))):
+            return False
         if self.T <= 0 or self.S <= 0 or self.K <= 0 or self.market_price < 0:
             return False
         
         # invalid option price violates the bounds
         if self.model_type == 'BlackScholes':
-            if self.option_type == 'Call' and (self.market_price > self.S or self.market_price < self.S - self.K * math.exp(-self.r * self.T)):
+            if self.is_call and (self.market_price > self.S or self.market_price < self.S - self.K * math.exp(-self.r * self.T)):
                 return False
-            elif self.option_type == 'Put' and (self.market_price > self.K * math.exp(-self.r * self.T) or self.market_price < self.K * math.exp(-self.r * self.T) - self.S):
+            elif not self.is_call and (self.market_price > self.K * math.exp(-self.r * self.T) or self.market_price < self.K * math.exp(-self.r * self.T) - self.S):
                 return False
         else:
-            if self.option_type == 'Call' and self.market_price < self.S - self.K * math.exp(-self.r * self.T):
+            if self.is_call and self.market_price < self.S - self.K * math.exp(-self.r * self.T):
                 return False
-            elif self.option_type == 'Put' and self.market_price < self.K * math.exp(-self.r * self.T) - self.S:
+            elif not self.is_call and self.market_price < self.K * math.exp(-self.r * self.T) - self.S:
                 return False
         
         return True
+
+
+def batch_implied_vol(S: np.ndarray, K: np.ndarray, T: np.ndarray, r: np.ndarray, market_price: np.ndarray,
+                      is_call: np.ndarray, model_id: np.ndarray, tolerance: float = 1e-8,
+                      max_iteration: int = 100) -> np.ndarray:
+    """
+    Calculate implied volatilities for arrays of options at once
+
+    Input:
+        S, K, T, r, market_price: float arrays, as in ImpliedVol
+        is_call: int8 array, 1 for 'Call' and 0 for 'Put'
+        model_id: int8 array, BLACK_SCHOLES or BACHELIER
+
+    Output:
+        Implied volatilities, nan for the invalid rows
+    """
+    S, K, T, r, market_price = (np.ascontiguousarray(x, dtype=np.float64) for x in (S, K, T, r, market_price))
+    is_call = np.ascontiguousarray(is_call, dtype=np.int8)
+    model_id = np.ascontiguousarray(model_id, dtype=np.int8)
+
+    out = np.empty(S.shape[0])
+    valid = np.empty(S.shape[0], dtype=np.bool_)
+
+    # split the rows by model once, so each kernel is specialized to a single model
+    bs_mask = model_id == BLACK_SCHOLES
+    for mask, kernel in ((bs_mask, _bs_batch_iv), (~bs_mask, _bachelier_batch_iv)):
+        rows = np.flatnonzero(mask)
+        if rows.size == 0:
+            continue
+        out_rows = np.empty(rows.size)
+        valid_rows = np.empty(rows.size, dtype=np.bool_)
+        kernel(S[rows], K[rows], T[rows], r[rows], market_price[rows], is_call[rows],
+               tolerance, max_iteration, out_rows, valid_rows)
+        out[rows] = out_rows
+        valid[rows] = valid_rows
+
+    # If Newton fails to converge, try Brent's method
+    for i in np.flatnonzero(valid & np.isnan(out)):
+        out[i] = _brent_implied_vol(S[i], K[i], T[i], r[i], market_price[i], bool(is_call[i]),
+                                    int(model_id[i]), tolerance, max_iteration)
+    return out
@@ -1,16 +1,58 @@
 import pandas as pd
+import numpy as np
 import math
+import functools
+import multiprocessing as mp
 
 import implied_vol
 
+
+@functools.lru_cache(maxsize=100000)
+def _solve_iv(S: float, K: float, T: float, r: float, market_price: float, option_type: str, model_type: str) -> float:
+    """
+    Calculate implied volatility, cached on the exact inputs so repeated options are solved once.
+    """
+    return implied_vol.ImpliedVol(S, K, T, r, market_price, option_type, model_type).calculate_implied_vol()
+
+
+def _chunk_solver(chunk: pd.DataFrame) -> np.ndarray:
+    """
+    Calculate implied volatilities for the rows of a chunk, in a worker process.
+    """
+    rows = chunk.rename(columns=RunCalculator.tuple_fields)[list(RunCalculator.tuple_fields.values())]
+    calculator = RunCalculator()
+    return np.array([calculator.solve_tuple(t) for t in rows.itertuples(index=False)], dtype=np.float64)
+
+
 class RunCalculator:
-    def process(self, input_file):
+    dtypes = {'Underlying': np.float64, 'Strike': np.float64, 'Days To Expiry': np.float64,
+              'Risk-Free Rate': np.float64, 'Market Price': np.float64,
+              'Option Type': 'category', 'Model Type': 'category'}
+
+    # CSV columns renamed to valid identifiers, for attribute access on itertuples rows
+    tuple_fields = {'Underlying': 'underlying', 'Strike': 'strike', 'Years To Expiry': 'years_to_expiry',
+                    'Risk-Free Rate': 'risk_free_rate', 'Market Price': 'market_price',
+                    'Option Type': 'option_type', 'Model Type': 'model_type'}
 
-        df = pd.read_csv(input_file)
+    def process(self, input_file, processes=None):
+        """
+        Calculate implied volatilities for input_file and save them to output.csv
+
+        By default all rows go through the compiled batch solver. If processes is given,
+        the rows are split into that many chunks and solved row by row in a process pool.
+        """
+
+        df = pd.read_csv(input_file, dtype=self.dtypes)
 
         df['Years To Expiry'] = df['Days To Expiry'] / 365.0
 
-        df['Implied Volatility'] = df.apply(self.calculate_row_iv, axis = 1)
+        if processes is not None:
+            chunks = [df.iloc[rows] for rows in np.array_split(np.arange(len(df)), processes)]
+            # spawn, not fork: forking after numba's parallel (tbb) runtime has started hangs at exit
+            with mp.get_context('spawn').Pool(processes) as pool:
+                df['Implied Volatility'] = np.concatenate(pool.map(_chunk_solver, chunks))
+        else:
+            df['Implied Volatility'] = self.solve_batch(df)
 
         df['Spot'] = df['Underlying']
 
@@ -18,21 +60,49 @@ class RunCalculator:
 
         df.to_csv('output.csv', columns = columns_tosave, index=False, float_format='%.10g')
 
-    def calculate_row_iv(self, row: pd.Series) -> float:
-        """
-        Calculate implied volatility for a single row.
-        """
-        calculator = implied_vol.ImpliedVol(
-            S=row['Underlying'],
-            K=row['Strike'],
-            T=row['Years To Expiry'],
-            r=row['Risk-Free Rate'],
-            market_price=row['Market Price'],
-            option_type=row['Option Type'],
-            model_type=row['Model Type'])
-        
-        return calculator.calculate_implied_vol()
-        
+    def solve_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate implied volatilities for all rows with the compiled batch solver.
+        """
+        return implied_vol.batch_implied_vol(
+            S=df['Underlying'].to_numpy(),
+            K=df['Strike'].to_numpy(),
+            T=df['Years To Expiry'].to_numpy(),
+            r=df['Risk-Free Rate'].to_numpy(),
+            market_price=df['Market Price'].to_numpy(),
+            is_call=self.category_flags(df['Option Type'], 'Call'),
+            model_id=self.model_ids(df['Model Type']))
+
+    def category_flags(self, column: pd.Series, category: str) -> np.ndarray:
+        """
+        Flag the rows of a categorical column equal to category, comparing the integer codes.
+        """
+        codes = column.cat.codes.to_numpy()
+        if category not in column.cat.categories:
+            return np.zeros(len(codes), dtype=np.int8)
+        return (codes == column.cat.categories.get_loc(category)).astype(np.int8)
+
+    def model_ids(self, column: pd.Series) -> np.ndarray:
+        """
+        Encode the Model Type column as implied_vol model ids.
+
+        Raises KeyError on a model other than 'BlackScholes' or 'Bachelier', like ImpliedVol.
+        """
+        is_bs = self.category_flags(column, 'BlackScholes').astype(bool)
+        is_bachelier = self.category_flags(column, 'Bachelier').astype(bool)
+        unknown = ~(is_bs | is_bachelier)
+        if unknown.any():
+            raise KeyError(column[unknown].iloc[0])
+        return np.where(is_bs, implied_vol.BLACK_SCHOLES, implied_vol.BACHELIER).astype(np.int8)
+
+    def solve_tuple(self, row) -> float:
+        """
+        Calculate implied volatility for a single row from DataFrame.itertuples, with the
+        columns renamed by tuple_fields.
+        """
+        return _solve_iv(row.underlying, row.strike, row.years_to_expiry, row.risk_free_rate,
+                         row.market_price, row.option_type, row.model_type)
+
 if __name__ == "__main__":
     runner = RunCalculator()
     runner.process("input.csv")
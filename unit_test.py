@@ -1,6 +1,13 @@
 import unittest
-from implied_vol import BSModel, BachelierModel, ImpliedVol
+from implied_vol import BSModel, BachelierModel, ImpliedVol, batch_implied_vol, BLACK_SCHOLES, BACHELIER, SIGMA_MIN, SIGMA_MAX, _brent_implied_vol
+from run_calculator import RunCalculator, _solve_iv, _chunk_solver
+import pandas as pd
+import numpy as np
 import math
+import os
+import subprocess
+import sys
+import tempfile
 
 class TestBlackScholesModel(unittest.TestCase):
     """Unit test for Black-Scholes model."""
@@ -12,7 +19,7 @@ class TestBlackScholesModel(unittest.TestCase):
         """Test for the call option price lower/upper bounds"""
         S, K, T, r, sigma = 100, 100, 1, 0.05, 0.2
         
-        price = self.model.calculate_price(S, K, T, r, sigma, 'Call')
+        price = self.model.calculate_price(S, K, T, r, sigma, True)
         
         # lower/upper bounds
         self.assertGreater(price, max(S - K * math.exp(-r * T),0))
@@ -22,7 +29,7 @@ class TestBlackScholesModel(unittest.TestCase):
         """Test for the put option price lower/upper bounds"""
         S, K, T, r, sigma = 100, 100, 1, 0.05, 0.2
         
-        price = self.model.calculate_price(S, K, T, r, sigma, 'Put')
+        price = self.model.calculate_price(S, K, T, r, sigma, False)
         
         # lower/upper bounds
         self.assertGreater(price, max(K * math.exp(-r * T) - S,0))
@@ -32,8 +39,8 @@ class TestBlackScholesModel(unittest.TestCase):
         """Test for the put call parity"""
         S, K, T, r, sigma = 100, 100, 1, 0.05, 0.2
         
-        call_price = self.model.calculate_price(S, K, T, r, sigma, 'Call')
-        put_price = self.model.calculate_price(S, K, T, r, sigma, 'Put')
+        call_price = self.model.calculate_price(S, K, T, r, sigma, True)
+        put_price = self.model.calculate_price(S, K, T, r, sigma, False)
         
         # Put-call parity: C - P = S - K*e^(-rT)
         expected_diff = S - K * math.exp(-r * T)
@@ -45,12 +52,24 @@ class TestBlackScholesModel(unittest.TestCase):
         """Test for zero volatility input"""
         S, K, T, r, sigma = 100, 90, 1, 0.05, 0
         
-        call_price = self.model.calculate_price(S, K, T, r, sigma, 'Call')
-        put_price = self.model.calculate_price(S, K, T, r, sigma, 'Put')
+        call_price = self.model.calculate_price(S, K, T, r, sigma, True)
+        put_price = self.model.calculate_price(S, K, T, r, sigma, False)
         
         self.assertEqual(call_price, 0.0)
         self.assertEqual(put_price, 0.0)
 
+    def test_analytic_vega(self):
+        """Test for the analytic vega against the central difference"""
+        S, K, T, r, sigma, h = 100, 110, 1, 0.05, 0.2, 1e-4
+        
+        fd_vega = (self.model.calculate_price(S, K, T, r, sigma + h, True)
+                   - self.model.calculate_price(S, K, T, r, sigma - h, True)) / (2 * h)
+        price, vega = self.model.price_and_vega(S, K, T, r, sigma, True)
+        
+        self.assertAlmostEqual(vega, fd_vega, places=5)
+        self.assertAlmostEqual(vega, self.model.calculate_vega(S, K, T, r, sigma, False), places=10)
+        self.assertAlmostEqual(price, self.model.calculate_price(S, K, T, r, sigma, True), places=10)
+
 
 class TestBachelierModel(unittest.TestCase):
     """Unit test for Bachelier model."""
@@ -62,7 +81,7 @@ class TestBachelierModel(unittest.TestCase):
         """Test for the call option price lower bounds"""
         S, K, T, r, sigma = 100, 100, 1, 0.05, 20
         
-        price = self.model.calculate_price(S, K, T, r, sigma, 'Call')
+        price = self.model.calculate_price(S, K, T, r, sigma, True)
         
         # lower bound
         self.assertGreater(price, max(S - K * math.exp(-r * T),0))
@@ -71,7 +90,7 @@ class TestBachelierModel(unittest.TestCase):
         """Test for the put option price lower bounds"""
         S, K, T, r, sigma = 100, 100, 1, 0.05, 20
         
-        price = self.model.calculate_price(S, K, T, r, sigma, 'Put')
+        price = self.model.calculate_price(S, K, T, r, sigma, False)
         
         # lower bound
         self.assertGreater(price, max(K * math.exp(-r * T) - S,0))
@@ -80,12 +99,40 @@ class TestBachelierModel(unittest.TestCase):
         """Test for the forward symmetry"""
         S, K, T, r, sigma = 100, 110, 1, 0, 20
         
-        call_price = self.model.calculate_price(S, K, T, r, sigma, 'Call')
-        put_price = self.model.calculate_price(K, S, T, r, sigma, 'Put')
+        call_price = self.model.calculate_price(S, K, T, r, sigma, True)
+        put_price = self.model.calculate_price(K, S, T, r, sigma, False)
         
         # Due to symmetry in normal distribution
         self.assertAlmostEqual(call_price, put_price, places=6)
 
+    def test_analytic_vega(self):
+        """Test for the analytic vega against the central difference"""
+        S, K, T, r, sigma, h = 100, 90, 1, 0.05, 20, 1e-4
+        
+        fd_vega = (self.model.calculate_price(S, K, T, r, sigma + h, False)
+                   - self.model.calculate_price(S, K, T, r, sigma - h, False)) / (2 * h)
+        price, vega = self.model.price_and_vega(S, K, T, r, sigma, False)
+        
+        self.assertAlmostEqual(vega, fd_vega, places=5)
+        self.assertAlmostEqual(vega, self.model.calculate_vega(S, K, T, r, sigma, True), places=10)
+        self.assertAlmostEqual(price, self.model.calculate_price(S, K, T, r, sigma, False), places=10)
+
+    def test_small_rate(self):
+        """Test for the price around the small |rT| expansion threshold, 2rT = 1e-4"""
+        S, K, T, sigma = 100, 105, 2, 20
+        
+        for r_threshold in (0.25e-4, -0.25e-4):
+            below = self.model.calculate_price(S, K, T, r_threshold * (1 - 1e-9), sigma, True)
+            above = self.model.calculate_price(S, K, T, r_threshold * (1 + 1e-9), sigma, True)
+            self.assertAlmostEqual(below, above, places=9)
+        
+        # r = 0: d_denominator = sigma * sqrt(T)
+        d_denominator = sigma * math.sqrt(T)
+        d = (S - K) / d_denominator
+        expected = (S - K) * 0.5 * math.erfc(-d / math.sqrt(2)) + d_denominator * math.exp(-0.5 * d * d) / math.sqrt(2 * math.pi)
+        self.assertAlmostEqual(self.model.calculate_price(S, K, T, 0.0, sigma, True), expected, places=10)
+        self.assertAlmostEqual(self.model.calculate_vega(S, K, T, 0.0, sigma, True), d_denominator / sigma * math.exp(-0.5 * d * d) / math.sqrt(2 * math.pi), places=10)
+
 
 class TestImpliedVolatilityCalculator(unittest.TestCase):
     """Unit tests for implied volatility calculator."""
@@ -99,7 +146,7 @@ class TestImpliedVolatilityCalculator(unittest.TestCase):
         
         # Calculate theoretical price
         bs_model = BSModel()
-        market_price = bs_model.calculate_price(S, K, T, r, true_sigma, 'Call')
+        market_price = bs_model.calculate_price(S, K, T, r, true_sigma, True)
         
         # Calculate implied volatility
         self.calculator = ImpliedVol(S, K, T, r, market_price, 'Call', 'BlackScholes')
@@ -107,6 +154,9 @@ class TestImpliedVolatilityCalculator(unittest.TestCase):
         
         # Should recover the original volatility
         self.assertAlmostEqual(implied_vol, true_sigma, places=6)
+        
+        # Same through the nogil Newton kernel
+        self.assertAlmostEqual(self.calculator.calculate_implied_vol(release_gil=True), true_sigma, places=6)
     
     def test_bachelier_implied_vol(self):
         """Test for the Bachelier implied vol"""
@@ -114,7 +164,7 @@ class TestImpliedVolatilityCalculator(unittest.TestCase):
         
         # Calculate theoretical price
         bachelier_model = BachelierModel()
-        market_price = bachelier_model.calculate_price(S, K, T, r, true_sigma, 'Call')
+        market_price = bachelier_model.calculate_price(S, K, T, r, true_sigma, True)
         
         # Calculate implied volatility
         self.calculator = ImpliedVol(S, K, T, r, market_price, 'Call', 'Bachelier')
@@ -123,6 +173,161 @@ class TestImpliedVolatilityCalculator(unittest.TestCase):
         # Should recover the original volatility
         self.assertAlmostEqual(implied_vol, true_sigma, places=6)
 
+    def test_price_at_bounds(self):
+        """Test for the market price at the lower/upper bounds"""
+        S, K, T, r = 100, 90, 1, 0.05
+        intrinsic = S - K * math.exp(-r * T)
+        
+        self.calculator = ImpliedVol(S, K, T, r, intrinsic, 'Call', 'BlackScholes')
+        self.assertEqual(self.calculator.calculate_implied_vol(), SIGMA_MIN)
+        
+        self.calculator = ImpliedVol(S, K, T, r, S, 'Call', 'BlackScholes')
+        self.assertEqual(self.calculator.calculate_implied_vol(), SIGMA_MAX)
+        
+        implied_vols = batch_implied_vol([S, S], [K, K], [T, T], [r, r], [intrinsic, S], [True, True],
+                                         [BACHELIER, BLACK_SCHOLES])
+        self.assertEqual(list(implied_vols), [SIGMA_MIN, SIGMA_MAX])
+
+    def test_non_finite_input(self):
+        """Test for NaN inputs, rejected by the input validation"""
+        nan = float('nan')
+        for model_type in ('BlackScholes', 'Bachelier'):
+            for S, T, r in ((100, 1, nan), (nan, 1, 0.05), (100, nan, 0.05)):
+                self.calculator = ImpliedVol(S, 100, T, r, 10, 'Put', model_type)
+                self.assertFalse(self.calculator.input_validation())
+                self.assertTrue(math.isnan(self.calculator.calculate_implied_vol()))
+        
+        implied_vols = batch_implied_vol([100, 100], [100, 100], [1, 1], [nan, nan], [10, 10], [0, 0],
+                                         [BLACK_SCHOLES, BACHELIER])
+        self.assertTrue(np.isnan(implied_vols).all())
+
+    def test_brent_implied_vol(self):
+        """Test for the Brent's method fallback"""
+        S, K, T, r = 100, 100, 1, 0.05
+        
+        for model, model_id, true_sigma in ((BSModel(), BLACK_SCHOLES, 0.2), (BachelierModel(), BACHELIER, 20)):
+            market_price = model.calculate_price(S, K, T, r, true_sigma, True)
+            implied_vol = _brent_implied_vol(S, K, T, r, market_price, True, model_id, 1e-8, 100)
+            self.assertAlmostEqual(implied_vol, true_sigma, places=6)
+        
+        # prices above the price at sigma_max are not bracketed
+        self.assertTrue(math.isnan(_brent_implied_vol(S, K, T, r, 99.5, True, BLACK_SCHOLES, 1e-8, 100)))
+        self.assertTrue(math.isnan(_brent_implied_vol(S, K, T, r, 1000.0, True, BACHELIER, 1e-8, 100)))
+
+    def test_batch_implied_vol(self):
+        """Test for the vectorized implied vol against the scalar calculator"""
+        S = [100, 100, 100, 100, 100]
+        K = [90, 110, 100, 100, 100]
+        T = [1, 0.5, 1, 1, 1]
+        r = [0.05, 0.01, 0.05, 0.05, 0.05]
+        sigma = [0.2, 0.3, 20, 15, 0.2]
+        is_call = [True, False, True, False, True]
+        model_type = ['BlackScholes', 'BlackScholes', 'Bachelier', 'Bachelier', 'BlackScholes']
+
+        models = {'BlackScholes': BSModel(), 'Bachelier': BachelierModel()}
+        market_price = [models[m].calculate_price(*args) for m, args in zip(model_type, zip(S, K, T, r, sigma, is_call))]
+        market_price[-1] = S[-1] + 1  # violates the upper bound
+
+        implied_vols = batch_implied_vol(S, K, T, r, market_price, is_call,
+                                         [BLACK_SCHOLES if m == 'BlackScholes' else BACHELIER for m in model_type])
+
+        for i in range(len(S) - 1):
+            self.assertAlmostEqual(implied_vols[i], sigma[i], places=6)
+        self.assertTrue(math.isnan(implied_vols[-1]))
+
+class TestRunCalculator(unittest.TestCase):
+    """Unit tests for the CSV processor."""
+    
+    def setUp(self):
+        self.runner = RunCalculator()
+        self.df = pd.DataFrame({
+            'Underlying': [100.0, 100.0, 100.0, 100.0],
+            'Strike': [90.0, 110.0, 90.0, 100.0],
+            'Years To Expiry': [1.0, 0.5, 1.0, 1.0],
+            'Risk-Free Rate': [0.05, 0.01, 0.05, 0.05],
+            'Market Price': [15.0, 9.0, 15.0, 8.0],
+            'Option Type': pd.Categorical(['Call', 'Put', 'Call', 'Put']),
+            'Model Type': pd.Categorical(['BlackScholes', 'Bachelier', 'BlackScholes', 'Bachelier'])})
+    
+    def test_category_flags(self):
+        """Test for the flags of a categorical column"""
+        column = pd.Series(['Call', 'Put', 'Call'], dtype='category')
+        
+        self.assertEqual(list(self.runner.category_flags(column, 'Call')), [1, 0, 1])
+        self.assertEqual(list(self.runner.category_flags(column, 'Put')), [0, 1, 0])
+        
+        # category missing from the column
+        flags = self.runner.category_flags(column, 'Straddle')
+        self.assertEqual(flags.dtype, np.int8)
+        self.assertEqual(list(flags), [0, 0, 0])
+    
+    def test_model_ids(self):
+        """Test for the model ids, unknown models raise KeyError"""
+        column = pd.Series(['Bachelier', 'BlackScholes', 'Bachelier'], dtype='category')
+        self.assertEqual(list(self.runner.model_ids(column)), [BACHELIER, BLACK_SCHOLES, BACHELIER])
+        
+        with self.assertRaises(KeyError):
+            self.runner.model_ids(pd.Series(['BlackScholes', 'Heston'], dtype='category'))
+        with self.assertRaises(KeyError):
+            self.runner.model_ids(pd.Series(['Bachelier', None], dtype='category'))
+    
+    def test_solve_batch_order(self):
+        """Test for the batch solver keeping the row order"""
+        implied_vols = self.runner.solve_batch(self.df)
+        
+        expected = batch_implied_vol(self.df['Underlying'], self.df['Strike'], self.df['Years To Expiry'],
+                                     self.df['Risk-Free Rate'], self.df['Market Price'],
+                                     [1, 0, 1, 0], [BLACK_SCHOLES, BACHELIER, BLACK_SCHOLES, BACHELIER])
+        np.testing.assert_array_equal(implied_vols, expected)
+    
+    def test_solve_iv_cache(self):
+        """Test for the cache of the per-row solver"""
+        args = (100.0, 95.0, 0.75, 0.02, 11.0, 'Call', 'BlackScholes')
+        first = _solve_iv(*args)
+        hits = _solve_iv.cache_info().hits
+        
+        self.assertEqual(_solve_iv(*args), first)
+        self.assertEqual(_solve_iv.cache_info().hits, hits + 1)
+    
+    def test_chunk_solver(self):
+        """Test for the per-row solver on a chunk with the CSV column names"""
+        chunk = self.df.assign(ID=range(len(self.df)), **{'Days To Expiry': self.df['Years To Expiry'] * 365.0})
+        
+        implied_vols = _chunk_solver(chunk)
+        
+        expected = [_solve_iv(*row) for row in zip(self.df['Underlying'], self.df['Strike'], self.df['Years To Expiry'],
+                                                   self.df['Risk-Free Rate'], self.df['Market Price'],
+                                                   self.df['Option Type'], self.df['Model Type'])]
+        np.testing.assert_array_equal(implied_vols, expected)
+        np.testing.assert_allclose(implied_vols, self.runner.solve_batch(self.df), rtol=1e-6)
+    
+    def test_process_batch_then_pool(self):
+        """Test for the batch path followed by the process pool path in one interpreter"""
+        repo = os.path.dirname(os.path.abspath(__file__))
+        script = (
+            "import sys, shutil\n"
+            f"sys.path.insert(0, {repo!r})\n"
+            "from run_calculator import RunCalculator\n"
+            "runner = RunCalculator()\n"
+            "runner.process('input.csv')\n"
+            "shutil.move('output.csv', 'output_batch.csv')\n"
+            "runner.process('input.csv', processes=2)\n")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            pd.read_csv(os.path.join(repo, 'input.csv'), nrows=200).to_csv(os.path.join(tmp, 'input.csv'), index=False)
+            
+            # must exit, forking after numba's parallel runtime started used to hang at exit
+            subprocess.run([sys.executable, '-c', script], cwd=tmp, check=True, timeout=120)
+            
+            batch = pd.read_csv(os.path.join(tmp, 'output_batch.csv'))
+            pool = pd.read_csv(os.path.join(tmp, 'output.csv'))
+        
+        self.assertEqual(len(batch), 200)
+        pd.testing.assert_frame_equal(batch.drop(columns='Implied Volatility'), pool.drop(columns='Implied Volatility'))
+        # Black-Scholes rows use Let's Be Rational per row and Newton in the batch, so the paths
+        # agree to the 1e-8 price tolerance rather than bit for bit
+        np.testing.assert_allclose(batch['Implied Volatility'], pool['Implied Volatility'], rtol=1e-4)
+
 if __name__ == '__main__':
     # Run all tests
     unittest.main(verbosity=2)
\ No newline at end of file